@@ -1,10 +1,15 @@
+import asyncio
 import logging
+import threading
 
-from dataclasses import asdict, dataclass, fields
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 
-from pymongo import ASCENDING, DESCENDING
+from cachetools import TTLCache
+from pymongo import ASCENDING, DESCENDING, InsertOne
 from pymongo.database import Database
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError, WriteError
 from slack_sdk.oauth.installation_store import InstallationStore
 from slack_sdk.oauth.installation_store.async_installation_store import (
     AsyncInstallationStore,
@@ -12,46 +17,140 @@ from slack_sdk.oauth.installation_store.async_installation_store import (
 from slack_sdk.oauth.installation_store.models.bot import Bot
 from slack_sdk.oauth.installation_store.models.installation import Installation
 
+try:
+    from motor.motor_asyncio import AsyncIOMotorDatabase
+except ImportError:  # motor is an optional dependency
+    AsyncIOMotorDatabase = None
+
+# Equality fields first, then the installed_at sort (ESR), so the latest
+# document can be read off the index without an in-memory SORT stage
+_INSTALLATIONS_USER_INDEX = [
+    ("client_id", ASCENDING),
+    ("enterprise_id", ASCENDING),
+    ("team_id", ASCENDING),
+    ("user_id", ASCENDING),
+    ("installed_at", DESCENDING),
+]
+_INSTALLATIONS_INDEX = [
+    ("client_id", ASCENDING),
+    ("enterprise_id", ASCENDING),
+    ("team_id", ASCENDING),
+    ("installed_at", DESCENDING),
+]
+_BOTS_INDEX = [
+    ("client_id", ASCENDING),
+    ("enterprise_id", ASCENDING),
+    ("team_id", ASCENDING),
+    ("installed_at", DESCENDING),
+]
+
+
+_INSTALLATION_FIELDS = tuple(Installation.__annotations__)
+_BOT_FIELDS = tuple(Bot.__annotations__)
+
+_BOT_TOKEN_FIELDS = (
+    "bot_token",
+    "bot_id",
+    "bot_user_id",
+    "bot_scopes",
+    "bot_refresh_token",
+    "bot_token_expires_at",
+)
 
-class InstallationDocument(dataclass(Installation)):
-    """
-    Helper dataclass that wraps the Installation class to
-    make it easier to convert to and from JSON.
+_PROJECTION = {"_id": 0, "client_id": 0}
+_BOT_TOKEN_PROJECTION = {"_id": 0, **{name: 1 for name in _BOT_TOKEN_FIELDS}}
+_BOT_PROJECTION = {"_id": 0, **{name: 1 for name in _BOT_FIELDS}}
+_SORT_DESC = [("installed_at", DESCENDING)]
+_BOTS_SORT = dict(_BOTS_INDEX)
+_BOTS_GROUP = {
+    "_id": {
+        "client_id": "$client_id",
+        "enterprise_id": "$enterprise_id",
+        "team_id": "$team_id",
+    },
+    **{name: {"$first": f"${name}"} for name in _BOT_FIELDS},
+}
+
+
+def _compile_to_document(names: Tuple[str, ...]) -> Callable[[Any, str], dict]:
+    """Generates a straight-line function that shallow-copies the given
+    attributes of a model into a document, without per-field dispatch
     """
+    items = ", ".join(f"{name!r}: obj.{name}" for name in names)
+    source = (
+        "def to_document(obj, client_id):\n"
+        f"    return {{'client_id': client_id, {items}}}\n"
+    )
+    namespace = {}
+    exec(source, namespace)
+    return namespace["to_document"]
 
-    @classmethod
-    def from_installation(cls, installation: Installation):
-        return InstallationDocument(
-            **{field.name: getattr(installation, field.name) for field in fields(cls)},
-        )
 
+_installation_to_document = _compile_to_document(_INSTALLATION_FIELDS)
+_bot_to_document = _compile_to_document(_BOT_FIELDS)
 
-class BotDocument(dataclass(Bot)):
-    """
-    Helper dataclass that wraps the Bot class to
-    make it easier to convert to and from JSON.
-    """
 
-    @classmethod
-    def from_bot(cls, bot: Bot):
-        return BotDocument(
-            **{field.name: getattr(bot, field.name) for field in fields(cls)},
+def _write_errors(error: BulkWriteError, count: int) -> Dict[int, PyMongoError]:
+    """Maps an unordered bulk_write failure back to the operations that failed,
+    the others were written. Each one gets the error insert_one would have raised.
+    """
+    if error.details.get("writeConcernErrors"):
+        return dict.fromkeys(range(count), error)
+
+    errors = {}
+    for write_error in error.details.get("writeErrors", []):
+        code = write_error.get("code")
+        error_class = DuplicateKeyError if code == 11000 else WriteError
+        errors[write_error["index"]] = error_class(
+            write_error.get("errmsg"), code, write_error
         )
+    return errors
 
 
 class MongoDBInstallationStore(AsyncInstallationStore, InstallationStore):
     def __init__(
         self,
-        db: Database,
+        db: Union[Database, "AsyncIOMotorDatabase"],
         client_id: str,
-        logger: logging.addLevelNameLogger = logging.getLogger(__name__),
+        logger: logging.Logger = logging.getLogger(__name__),
         installations_collection_name: str = "slack_installations",
         bots_collection_name: str = "slack_bots",
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        cache_maxsize: int = 10_000,
+        cache_ttl: float = 60,
+        max_workers: int = 16,
+        batch_window_ms: float = 1,
     ):
         self.slack_installations_collection = db[installations_collection_name]
         self.slack_bots_collection = db[bots_collection_name]
+        self._motor = AsyncIOMotorDatabase is not None and isinstance(
+            db, AsyncIOMotorDatabase
+        )
         self.client_id = client_id
+        self._query_base = {"client_id": client_id}
         self._logger = logger
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending_installs: List[InsertOne] = []
+        self._pending_install_futures: List[asyncio.Future] = []
+        self._pending_bots: List[InsertOne] = []
+        self._pending_futures: List[asyncio.Future] = []
+        self._batch_full: Optional[asyncio.Event] = None
+        self._flusher_task: Optional[asyncio.Task] = None
+        # A cache_maxsize or cache_ttl of 0 disables the cache
+        self._cache_enabled = cache_maxsize > 0 and cache_ttl > 0
+        self._bot_cache = TTLCache(maxsize=cache_maxsize, ttl=cache_ttl)
+        self._installation_cache = TTLCache(maxsize=cache_maxsize, ttl=cache_ttl)
+        self._installation_cache_keys: Dict[tuple, Set[tuple]] = {}
+        self._cache_generations: Dict[tuple, int] = {}
+        self._cache_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.batch_window_ms = batch_window_ms
+        self._bot_batch: List[Tuple[tuple, asyncio.Future]] = []
+        self._batch_timer: Optional[asyncio.TimerHandle] = None
+        self._batch_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._bot_batch_tasks: Set[asyncio.Task] = set()
 
     @property
     def logger(self) -> logging.Logger:
@@ -59,58 +158,326 @@ class MongoDBInstallationStore(AsyncInstallationStore, InstallationStore):
             self._logger = logging.getLogger(__name__)
         return self._logger
 
+    def _check_sync(self):
+        if self._motor:
+            raise RuntimeError(
+                "Only the async_* methods can be used with a motor database"
+            )
+
     def init(self):
         """Initialize database store by ensuring indexes exist on the proper fields"""
+        self._check_sync()
+
         self.slack_installations_collection.create_index(
-            [
-                ("client_id", ASCENDING),
-                ("enterprise_id", ASCENDING),
-                ("team_id", ASCENDING),
-                ("user_id", ASCENDING),
-                ("installed_at", ASCENDING),
-            ],
+            _INSTALLATIONS_USER_INDEX,
             background=True,
         )
         self.slack_installations_collection.create_index(
-            [
-                ("client_id", ASCENDING),
-                ("enterprise_id", ASCENDING),
-                ("team_id", ASCENDING),
-                ("installed_at", ASCENDING),
-            ],
+            _INSTALLATIONS_INDEX,
+            background=True,
+        )
+        self.slack_bots_collection.create_index(
+            _BOTS_INDEX,
             background=True,
         )
 
+    async def async_init(self):
+        """Initialize database store by ensuring indexes exist on the proper fields"""
+        if not self._motor:
+            await self._run(self.init)
+            return
+
+        await asyncio.gather(
+            self.slack_installations_collection.create_index(
+                _INSTALLATIONS_USER_INDEX,
+                background=True,
+            ),
+            self.slack_installations_collection.create_index(
+                _INSTALLATIONS_INDEX,
+                background=True,
+            ),
+            self.slack_bots_collection.create_index(
+                _BOTS_INDEX,
+                background=True,
+            ),
+        )
+
+    def _installation_document(self, installation: Installation) -> dict:
+        return _installation_to_document(installation, self.client_id)
+
+    def _bot_document(self, bot: Bot) -> dict:
+        return _bot_to_document(bot, self.client_id)
+
+    def _cache_get(self, cache: TTLCache, key: tuple) -> Tuple[Any, int]:
+        """Returns the cached value for the key, or None, along with the current
+        generation of its workspace / org, to be passed on to _cache_put
+        """
+        if not self._cache_enabled:
+            return None, 0
+
+        with self._cache_lock:
+            return cache.get(key), self._cache_generations.get(key[:2], 0)
+
+    def _cache_put(self, cache: TTLCache, key: tuple, value: Any, generation: int):
+        """Caches the value unless its workspace / org has been invalidated since
+        the generation was read, in which case the value may predate a save or delete
+        """
+        if not self._cache_enabled:
+            return
+
+        workspace = key[:2]
+        with self._cache_lock:
+            if self._cache_generations.get(workspace, 0) != generation:
+                return
+
+            cache[key] = value
+            if cache is self._installation_cache:
+                # Keys that expire or get evicted stay here until the workspace / org
+                # is invalidated, which is bounded by its number of users
+                self._installation_cache_keys.setdefault(workspace, set()).add(key)
+
+    def _invalidate_cache(
+        self,
+        enterprise_id: Optional[str],
+        team_id: Optional[str],
+        is_enterprise_install: Optional[bool] = False,
+    ):
+        """Drops the cached bots and installations of the workspace / org"""
+        if not self._cache_enabled:
+            return
+
+        workspaces = [(enterprise_id, team_id)]
+        if is_enterprise_install and team_id is not None:
+            workspaces.append((enterprise_id, None))
+
+        with self._cache_lock:
+            for workspace in workspaces:
+                self._cache_generations[workspace] = (
+                    self._cache_generations.get(workspace, 0) + 1
+                )
+                self._bot_cache.pop(workspace, None)
+                for key in self._installation_cache_keys.pop(workspace, ()):
+                    self._installation_cache.pop(key, None)
+
     def save(self, installation: Installation):
         """Saves an installation data"""
-        self.logger.debug("installation: %s", installation)
+        self._check_sync()
 
-        installation_document = InstallationDocument.from_installation(
-            installation=installation
-        )
+        debug = self.logger.isEnabledFor(logging.DEBUG)
 
-        self.logger.debug("installation_document: %s", installation_document)
+        if debug:
+            self.logger.debug("installation: %s", installation)
 
         insert_result = self.slack_installations_collection.insert_one(
-            {"client_id": self.client_id, **asdict(installation_document)}
+            self._installation_document(installation)
         )
-        self.logger.debug("insert_result: %s", insert_result)
+        if debug:
+            self.logger.debug("insert_result: %s", insert_result)
 
-        self.save_bot(installation.to_bot())
+        insert_result = self.slack_bots_collection.insert_one(
+            self._bot_document(installation.to_bot())
+        )
+        if debug:
+            self.logger.debug("insert_result: %s", insert_result)
+
+        self._invalidate_cache(
+            installation.enterprise_id,
+            installation.team_id,
+            installation.is_enterprise_install,
+        )
 
     def save_bot(self, bot: Bot):
         """Saves a bot installation data"""
-        self.logger.debug("bot: %s", bot)
+        self._check_sync()
 
-        bot_document = BotDocument.from_bot(bot=bot)
+        debug = self.logger.isEnabledFor(logging.DEBUG)
 
-        self.logger.debug("bot_document: %s", bot_document)
+        if debug:
+            self.logger.debug("bot: %s", bot)
 
-        insert_result = self.slack_bots_collection.insert_one(
-            {"client_id": self.client_id, **asdict(bot_document)}
+        insert_result = self.slack_bots_collection.insert_one(self._bot_document(bot))
+        if debug:
+            self.logger.debug("insert_result: %s", insert_result)
+
+        self._invalidate_cache(
+            bot.enterprise_id, bot.team_id, bot.is_enterprise_install
+        )
+
+    async def _async_bulk_write(self, collection, ops: List[InsertOne]):
+        """Writes the queued operations of a collection with one unordered bulk_write"""
+        if self._motor:
+            bulk_write_result = await collection.bulk_write(ops, ordered=False)
+        else:
+            bulk_write_result = await self._run(
+                collection.bulk_write, ops, ordered=False
+            )
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("bulk_write_result: %s", bulk_write_result)
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """Runs a blocking method in the executor so it doesn't block the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    async def _load_bot(self, key: tuple) -> Optional[Bot]:
+        """Queues the key for the next batched bot lookup and waits for its result"""
+        loop = asyncio.get_running_loop()
+        if self._batch_loop is not loop:
+            # A batch left behind by an event loop that stopped before its timer
+            # fired can never be flushed, and nothing can await its futures anymore
+            self._bot_batch, self._batch_timer = [], None
+            self._batch_loop = loop
+
+        future = loop.create_future()
+        self._bot_batch.append((key, future))
+
+        if self._batch_timer is None or self._batch_timer.cancelled():
+            self._batch_timer = loop.call_later(
+                self.batch_window_ms / 1000, self._flush_bot_batch
+            )
+
+        return await future
+
+    def _flush_bot_batch(self):
+        batch, self._bot_batch = self._bot_batch, []
+        self._batch_timer = None
+
+        task = asyncio.ensure_future(self._resolve_bot_batch(batch))
+        self._bot_batch_tasks.add(task)
+        task.add_done_callback(self._bot_batch_tasks.discard)
+
+    async def _resolve_bot_batch(self, batch: List[Tuple[tuple, asyncio.Future]]):
+        try:
+            bots = await self._async_find_bots(list({key for key, _ in batch}))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for key, future in batch:
+                if not future.done():
+                    future.set_result(bots.get(key))
+
+    async def _enqueue(
+        self, installation_op: Optional[InsertOne], bot_op: InsertOne
+    ) -> None:
+        """Queues the operations for the next flush and waits until they're written"""
+        loop = asyncio.get_running_loop()
+        if any(future.get_loop() is not loop for future in self._pending_futures):
+            self._drop_stale_ops(loop)
+
+        future = loop.create_future()
+
+        if installation_op is not None:
+            self._pending_installs.append(installation_op)
+            self._pending_install_futures.append(future)
+        self._pending_bots.append(bot_op)
+        self._pending_futures.append(future)
+
+        # The previous flusher may have been cancelled, or left behind by an
+        # event loop that is no longer running
+        if (
+            self._flusher_task is None
+            or self._flusher_task.done()
+            or self._flusher_task.get_loop() is not loop
+        ):
+            self._batch_full = asyncio.Event()
+            self._flusher_task = asyncio.create_task(self._flusher(self._batch_full))
+
+        if len(self._pending_bots) >= self.batch_size:
+            self._batch_full.set()
+
+        await future
+
+    def _drop_stale_ops(self, loop: asyncio.AbstractEventLoop):
+        """Drops the operations queued from another event loop. That loop stopped
+        before they were flushed, so nothing can be awaiting them anymore
+        """
+        installs = [
+            (op, future)
+            for op, future in zip(self._pending_installs, self._pending_install_futures)
+            if future.get_loop() is loop
+        ]
+        bots = [
+            (op, future)
+            for op, future in zip(self._pending_bots, self._pending_futures)
+            if future.get_loop() is loop
+        ]
+        self._pending_installs = [op for op, _ in installs]
+        self._pending_install_futures = [future for _, future in installs]
+        self._pending_bots = [op for op, _ in bots]
+        self._pending_futures = [future for _, future in bots]
+
+    async def _flusher(self, batch_full: asyncio.Event):
+        """Flushes the queues every flush_interval seconds or when a batch is full"""
+        try:
+            while self._pending_futures:
+                try:
+                    await asyncio.wait_for(batch_full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                await self._flush()
+        finally:
+            # Unless a newer flusher, with its own event, has replaced this one
+            if self._batch_full is batch_full:
+                self._flusher_task = None
+
+    async def _flush(self):
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+
+        installation_ops, self._pending_installs = self._pending_installs, []
+        install_futures, self._pending_install_futures = (
+            self._pending_install_futures,
+            [],
         )
+        bot_ops, self._pending_bots = self._pending_bots, []
+        all_futures, self._pending_futures = self._pending_futures, []
+        self._batch_full.clear()
 
-        self.logger.debug("insert_result: %s", insert_result)
+        if debug:
+            self.logger.debug(
+                "installation_ops: %s, bot_ops: %s", len(installation_ops), len(bot_ops)
+            )
+
+        # Both collections are written concurrently to overlap their round-trips.
+        # The bot of an installation that fails is still written, which is
+        # harmless: find_bot only reads the latest bot, and every reinstall
+        # appends a new one anyway
+        writes = []
+        if installation_ops:
+            writes.append(
+                (self.slack_installations_collection, installation_ops, install_futures)
+            )
+        if bot_ops:
+            writes.append((self.slack_bots_collection, bot_ops, all_futures))
+
+        results = await asyncio.gather(
+            *[self._async_bulk_write(collection, ops) for collection, ops, _ in writes],
+            return_exceptions=True,
+        )
+
+        # An installation error takes precedence over the error of its bot
+        errors: Dict[asyncio.Future, BaseException] = {}
+        for (_, ops, futures), result in zip(writes, results):
+            if isinstance(result, BulkWriteError):
+                for index, error in _write_errors(result, len(ops)).items():
+                    errors.setdefault(futures[index], error)
+            elif isinstance(result, BaseException):
+                for future in futures:
+                    errors.setdefault(future, result)
+
+        for future in all_futures:
+            if future.done():
+                continue
+            try:
+                if future in errors:
+                    future.set_exception(errors[future])
+                else:
+                    future.set_result(None)
+            except RuntimeError:  # Its event loop is closed
+                pass
 
     def find_bot(
         self,
@@ -120,36 +487,137 @@ class MongoDBInstallationStore(AsyncInstallationStore, InstallationStore):
         is_enterprise_install: Optional[bool] = False,
     ) -> Optional[Bot]:
         """Finds a bot scope installation per workspace / org"""
-        self.logger.debug(
-            "enterprise_id: %s, team_id: %s, is_enterprise_install: %s",
+        self._check_sync()
+
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+
+        if debug:
+            self.logger.debug(
+                "enterprise_id: %s, team_id: %s, is_enterprise_install: %s",
+                enterprise_id,
+                team_id,
+                is_enterprise_install,
+            )
+
+        key = (
             enterprise_id,
-            team_id,
-            is_enterprise_install,
+            None if team_id is None or is_enterprise_install else team_id,
         )
+        bot, generation = self._cache_get(self._bot_cache, key)
+        if bot is not None:
+            if debug:
+                self.logger.debug("cached bot: %s", bot)
+            return bot
 
         doc = self.slack_bots_collection.find_one(
-            {
-                "client_id": self.client_id,
-                "enterprise_id": enterprise_id,
-                "team_id": (
-                    None if team_id is None or is_enterprise_install else team_id
-                ),
-            },
-            {"_id": 0, "client_id": 0},
-            sort=[("installed_at", DESCENDING)],
+            {**self._query_base, "enterprise_id": key[0], "team_id": key[1]},
+            _BOT_PROJECTION,
+            sort=_SORT_DESC,
         )
 
-        self.logger.debug("doc: %s", doc)
+        if debug:
+            self.logger.debug("doc: %s", doc)
 
         if doc is None:
             return None
 
-        bot = BotDocument(**doc)
+        bot = Bot(**doc)
 
-        self.logger.debug("bot: %s", bot)
+        if debug:
+            self.logger.debug("bot: %s", bot)
+
+        self._cache_put(self._bot_cache, key, bot, generation)
 
         return bot
 
+    def _bots_pipeline(self, keys: List[tuple]) -> List[dict]:
+        # $sort on the bots index immediately followed by a $group that only uses
+        # $first lets the server read just the first index entry of each key
+        return [
+            {
+                "$match": {
+                    **self._query_base,
+                    "$or": [
+                        {"enterprise_id": enterprise_id, "team_id": team_id}
+                        for enterprise_id, team_id in keys
+                    ],
+                }
+            },
+            {"$sort": _BOTS_SORT},
+            {"$group": _BOTS_GROUP},
+        ]
+
+    def _bot_generations(self, keys: List[tuple]) -> Dict[tuple, int]:
+        with self._cache_lock:
+            return {key: self._cache_generations.get(key, 0) for key in keys}
+
+    def _cache_bots(
+        self, docs: Dict[tuple, dict], generations: Dict[tuple, int]
+    ) -> Dict[tuple, Bot]:
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+
+        bots = {}
+        for key, doc in docs.items():
+            if debug:
+                self.logger.debug("doc: %s", doc)
+
+            bots[key] = bot = Bot(**doc)
+            self._cache_put(self._bot_cache, key, bot, generations[key])
+
+        return bots
+
+    def _grouped_bot_docs(self, results: Iterable[dict]) -> Dict[tuple, dict]:
+        docs = {}
+        for result in results:
+            group = result.pop("_id")
+            docs[(group.get("enterprise_id"), group.get("team_id"))] = result
+        return docs
+
+    def _find_bots(self, keys: List[tuple]) -> Dict[tuple, Bot]:
+        """Finds the latest bot for each of the (enterprise_id, team_id) keys
+        in a single query
+        """
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("keys: %s", keys)
+
+        generations = self._bot_generations(keys)
+        if len(keys) == 1:
+            (key,) = keys
+            doc = self.slack_bots_collection.find_one(
+                {**self._query_base, "enterprise_id": key[0], "team_id": key[1]},
+                _BOT_PROJECTION,
+                sort=_SORT_DESC,
+            )
+            docs = {} if doc is None else {key: doc}
+        else:
+            docs = self._grouped_bot_docs(
+                self.slack_bots_collection.aggregate(self._bots_pipeline(keys))
+            )
+
+        return self._cache_bots(docs, generations)
+
+    async def _async_find_bots(self, keys: List[tuple]) -> Dict[tuple, Bot]:
+        if not self._motor:
+            return await self._run(self._find_bots, keys)
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("keys: %s", keys)
+
+        generations = self._bot_generations(keys)
+        if len(keys) == 1:
+            (key,) = keys
+            doc = await self.slack_bots_collection.find_one(
+                {**self._query_base, "enterprise_id": key[0], "team_id": key[1]},
+                _BOT_PROJECTION,
+                sort=_SORT_DESC,
+            )
+            docs = {} if doc is None else {key: doc}
+        else:
+            cursor = self.slack_bots_collection.aggregate(self._bots_pipeline(keys))
+            docs = self._grouped_bot_docs(await cursor.to_list(None))
+
+        return self._cache_bots(docs, generations)
+
     def find_installation(
         self,
         *,
@@ -161,59 +629,115 @@ class MongoDBInstallationStore(AsyncInstallationStore, InstallationStore):
         """Finds a relevant installation for the given IDs.
         If the user_id is absent, this method may return the latest installation in the workspace / org.
         """
-        self.logger.debug(
-            "enterprise_id: %s, team_id: %s, user_id: %s, is_enterprise_install: %s",
+        self._check_sync()
+
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+
+        if debug:
+            self.logger.debug(
+                "enterprise_id: %s, team_id: %s, user_id: %s, is_enterprise_install: %s",
+                enterprise_id,
+                team_id,
+                user_id,
+                is_enterprise_install,
+            )
+        key = (
             enterprise_id,
-            team_id,
+            None if team_id is None or is_enterprise_install else team_id,
             user_id,
-            is_enterprise_install,
         )
-        query = {
-            "client_id": self.client_id,
-            "enterprise_id": enterprise_id,
-            "team_id": None if team_id is None or is_enterprise_install else team_id,
-        }
-        if user_id is not None:
+        installation, generation = self._cache_get(self._installation_cache, key)
+        if installation is not None:
+            if debug:
+                self.logger.debug("cached installation: %s", installation)
+            return installation
+
+        query = {**self._query_base, "enterprise_id": key[0], "team_id": key[1]}
+        if user_id is None:
+            doc = self.slack_installations_collection.find_one(
+                query,
+                _PROJECTION,
+                sort=_SORT_DESC,
+            )
+        else:
             query["user_id"] = user_id
+            doc = self._find_user_installation(query)
 
-        doc = self.slack_installations_collection.find_one(
-            query, {"_id": 0, "client_id": 0}, sort=[("installed_at", DESCENDING)]
-        )
+        return self._cache_installation(key, doc, generation)
+
+    def _cache_installation(
+        self, key: tuple, doc: Optional[dict], generation: int
+    ) -> Optional[Installation]:
+        debug = self.logger.isEnabledFor(logging.DEBUG)
 
-        self.logger.debug("doc: %s", doc)
+        if debug:
+            self.logger.debug("doc: %s", doc)
 
         if doc is None:
             return None
 
-        if user_id is not None:
-            latest_bot_token_doc = self.slack_installations_collection.find_one(
+        installation = Installation(**doc)
+
+        if debug:
+            self.logger.debug("installation: %s", installation)
+
+        self._cache_put(self._installation_cache, key, installation, generation)
+
+        return installation
+
+    def _find_user_installation(self, query: dict) -> Optional[dict]:
+        """Finds the latest installation for the query, with the bot fields
+        taken from the latest installation that has a bot token.
+        Both lookups read a single document off the user index, and the second
+        one is only needed when the latest installation has no bot token.
+        """
+        doc = self.slack_installations_collection.find_one(
+            query,
+            _PROJECTION,
+            sort=_SORT_DESC,
+        )
+        if doc is None or doc.get("bot_token") is not None:
+            return doc
+
+        return self._merge_user_installation(
+            doc,
+            self.slack_installations_collection.find_one(
                 {**query, "bot_token": {"$ne": None}},
-                {"_id": 0, "client_id": 0},
-                sort=[("installed_at", DESCENDING)],
-            )
+                _BOT_TOKEN_PROJECTION,
+                sort=_SORT_DESC,
+            ),
+        )
 
-            self.logger.info("latest_bot_token_doc: %s", latest_bot_token_doc)
-
-            if latest_bot_token_doc is not None:
-                doc.update(
-                    {
-                        field: latest_bot_token_doc[field]
-                        for field in (
-                            "bot_token",
-                            "bot_id",
-                            "bot_user_id",
-                            "bot_scopes",
-                            "bot_refresh_token",
-                            "bot_token_expires_at",
-                        )
-                    }
-                )
+    async def _async_find_user_installation(self, query: dict) -> Optional[dict]:
+        doc = await self.slack_installations_collection.find_one(
+            query,
+            _PROJECTION,
+            sort=_SORT_DESC,
+        )
+        if doc is None or doc.get("bot_token") is not None:
+            return doc
 
-        installation = InstallationDocument(**doc)
+        return self._merge_user_installation(
+            doc,
+            await self.slack_installations_collection.find_one(
+                {**query, "bot_token": {"$ne": None}},
+                _BOT_TOKEN_PROJECTION,
+                sort=_SORT_DESC,
+            ),
+        )
 
-        self.logger.debug("installation: %s", installation)
+    def _merge_user_installation(
+        self, doc: dict, latest_bot_token_doc: Optional[dict]
+    ) -> dict:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("latest_bot_token_doc: %s", latest_bot_token_doc)
 
-        return installation
+        if latest_bot_token_doc is not None:
+            doc.update(
+                {field: latest_bot_token_doc[field] for field in _BOT_TOKEN_FIELDS}
+            )
+
+        return doc
 
     def delete_bot(
         self,
@@ -222,15 +746,19 @@ class MongoDBInstallationStore(AsyncInstallationStore, InstallationStore):
         team_id: Optional[str],
     ) -> None:
         """Deletes a bot scope installation per workspace / org"""
-        self.logger.debug("enterprise_id: %s, team_id: %s", enterprise_id, team_id)
+        self._check_sync()
+
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+
+        if debug:
+            self.logger.debug("enterprise_id: %s, team_id: %s", enterprise_id, team_id)
         delete_result = self.slack_bots_collection.delete_many(
-            {
-                "client_id": self.client_id,
-                "enterprise_id": enterprise_id,
-                "team_id": team_id,
-            }
+            {**self._query_base, "enterprise_id": enterprise_id, "team_id": team_id}
         )
-        self.logger.debug("delete_result: %s", delete_result)
+        if debug:
+            self.logger.debug("delete_result: %s", delete_result)
+
+        self._invalidate_cache(enterprise_id, team_id)
 
     def delete_installation(
         self,
@@ -240,31 +768,63 @@ class MongoDBInstallationStore(AsyncInstallationStore, InstallationStore):
         user_id: Optional[str] = None,
     ) -> None:
         """Deletes an installation that matches the given IDs"""
-        self.logger.info(
-            "enterprise_id: %s, team_id: %s, user_id: %s",
-            enterprise_id,
-            team_id,
-            user_id,
-        )
-        query = {
-            "client_id": self.client_id,
-            "enterprise_id": enterprise_id,
-            "team_id": team_id,
-        }
+        self._check_sync()
+
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+
+        if debug:
+            self.logger.debug(
+                "enterprise_id: %s, team_id: %s, user_id: %s",
+                enterprise_id,
+                team_id,
+                user_id,
+            )
+        query = {**self._query_base, "enterprise_id": enterprise_id, "team_id": team_id}
         if user_id is not None:
             query["user_id"] = user_id
 
-        delete_result = self.slack_bots_collection.delete_many(query)
+        delete_result = self.slack_installations_collection.delete_many(query)
+
+        if debug:
+            self.logger.debug("delete_result: %s", delete_result)
+
+        if user_id is None:
+            # The whole workspace / org is gone, so its bots can't be used either
+            delete_result = self.slack_bots_collection.delete_many(query)
+
+            if debug:
+                self.logger.debug("delete_result: %s", delete_result)
 
-        self.logger.info("delete_result: %s", delete_result)
+        self._invalidate_cache(enterprise_id, team_id)
 
     async def async_save(self, installation: Installation):
         """Saves an installation data"""
-        self.save(installation)
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+
+        if debug:
+            self.logger.debug("installation: %s", installation)
+
+        await self._enqueue(
+            InsertOne(self._installation_document(installation)),
+            InsertOne(self._bot_document(installation.to_bot())),
+        )
+        self._invalidate_cache(
+            installation.enterprise_id,
+            installation.team_id,
+            installation.is_enterprise_install,
+        )
 
     async def async_save_bot(self, bot: Bot):
         """Saves a bot installation data"""
-        self.save_bot(bot)
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+
+        if debug:
+            self.logger.debug("bot: %s", bot)
+
+        await self._enqueue(None, InsertOne(self._bot_document(bot)))
+        self._invalidate_cache(
+            bot.enterprise_id, bot.team_id, bot.is_enterprise_install
+        )
 
     async def async_find_bot(
         self,
@@ -274,9 +834,15 @@ class MongoDBInstallationStore(AsyncInstallationStore, InstallationStore):
         is_enterprise_install: Optional[bool] = False,
     ) -> Optional[Bot]:
         """Finds a bot scope installation per workspace / org"""
-        return self.find_bot(
-            enterprise_id, team_id, is_enterprise_install=is_enterprise_install
+        key = (
+            enterprise_id,
+            None if team_id is None or is_enterprise_install else team_id,
         )
+        bot, _ = self._cache_get(self._bot_cache, key)
+        if bot is not None:
+            return bot
+
+        return await self._load_bot(key)
 
     async def async_find_installation(
         self,
@@ -289,12 +855,36 @@ class MongoDBInstallationStore(AsyncInstallationStore, InstallationStore):
         """Finds a relevant installation for the given IDs.
         If the user_id is absent, this method may return the latest installation in the workspace / org.
         """
-        return self.find_installation(
+        if not self._motor:
+            return await self._run(
+                self.find_installation,
+                enterprise_id=enterprise_id,
+                team_id=team_id,
+                user_id=user_id,
+                is_enterprise_install=is_enterprise_install,
+            )
+
+        key = (
             enterprise_id,
-            team_id,
-            user_id=user_id,
-            is_enterprise_install=is_enterprise_install,
+            None if team_id is None or is_enterprise_install else team_id,
+            user_id,
         )
+        installation, generation = self._cache_get(self._installation_cache, key)
+        if installation is not None:
+            return installation
+
+        query = {**self._query_base, "enterprise_id": key[0], "team_id": key[1]}
+        if user_id is None:
+            doc = await self.slack_installations_collection.find_one(
+                query,
+                _PROJECTION,
+                sort=_SORT_DESC,
+            )
+        else:
+            query["user_id"] = user_id
+            doc = await self._async_find_user_installation(query)
+
+        return self._cache_installation(key, doc, generation)
 
     async def async_delete_bot(
         self,
@@ -303,7 +893,19 @@ class MongoDBInstallationStore(AsyncInstallationStore, InstallationStore):
         team_id: Optional[str],
     ) -> None:
         """Deletes a bot scope installation per workspace / org"""
-        self.delete_bot(enterprise_id, team_id)
+        if not self._motor:
+            await self._run(
+                self.delete_bot, enterprise_id=enterprise_id, team_id=team_id
+            )
+            return
+
+        delete_result = await self.slack_bots_collection.delete_many(
+            {**self._query_base, "enterprise_id": enterprise_id, "team_id": team_id}
+        )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("delete_result: %s", delete_result)
+
+        self._invalidate_cache(enterprise_id, team_id)
 
     async def async_delete_installation(
         self,
@@ -313,4 +915,31 @@ class MongoDBInstallationStore(AsyncInstallationStore, InstallationStore):
         user_id: Optional[str] = None,
     ) -> None:
         """Deletes an installation that matches the given IDs"""
-        self.delete_installation(enterprise_id, team_id, user_id=user_id)
+        if not self._motor:
+            await self._run(
+                self.delete_installation,
+                enterprise_id=enterprise_id,
+                team_id=team_id,
+                user_id=user_id,
+            )
+            return
+
+        query = {**self._query_base, "enterprise_id": enterprise_id, "team_id": team_id}
+        if user_id is not None:
+            deletes = [
+                self.slack_installations_collection.delete_many(
+                    {**query, "user_id": user_id}
+                )
+            ]
+        else:
+            deletes = [
+                self.slack_installations_collection.delete_many(query),
+                self.slack_bots_collection.delete_many(query),
+            ]
+
+        delete_results = await asyncio.gather(*deletes)
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("delete_results: %s", delete_results)
+
+        self._invalidate_cache(enterprise_id, team_id)
@@ -1,26 +1,45 @@
+import asyncio
 import logging
+import secrets
 
-from uuid import uuid4
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from time import time
+from typing import Any, Callable, List, Optional, Tuple, Union
 
 from pymongo import ASCENDING
 from pymongo.database import Database
-from time import time
 
 from slack_sdk.oauth.state_store import OAuthStateStore
 from slack_sdk.oauth.state_store.async_state_store import AsyncOAuthStateStore
 
+try:
+    from motor.motor_asyncio import AsyncIOMotorDatabase
+except ImportError:  # motor is an optional dependency
+    AsyncIOMotorDatabase = None
+
+_STATE_INDEX = [("state", ASCENDING)]
+_EXPIRE_AT_INDEX = [("expire_at", ASCENDING)]
+_EXPIRE_AT_PROJECTION = {"_id": 0, "expire_at": 1}
+
 
 class MongoDBAsyncOAuthStateStore(OAuthStateStore, AsyncOAuthStateStore):
     def __init__(
         self,
-        db: Database,
+        db: Union[Database, "AsyncIOMotorDatabase"],
         expiration_seconds: int,
         logger: logging.Logger = logging.getLogger(__name__),
         oauth_states_collection_name: str = "oauth_states",
+        max_workers: int = 16,
     ):
         self.slack_oauth_states_collection = db[oauth_states_collection_name]
+        self._motor = AsyncIOMotorDatabase is not None and isinstance(
+            db, AsyncIOMotorDatabase
+        )
         self.expiration_seconds = expiration_seconds
         self._logger = logger
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
 
     @property
     def logger(self) -> logging.Logger:
@@ -28,40 +47,143 @@ class MongoDBAsyncOAuthStateStore(OAuthStateStore, AsyncOAuthStateStore):
             self._logger = logging.getLogger(__name__)
         return self._logger
 
+    def _check_sync(self):
+        if self._motor:
+            raise RuntimeError(
+                "Only the async_* methods can be used with a motor database"
+            )
+
     def init(self):
         """Initialize database store by ensuring indexes exist on the proper fields"""
+        self._check_sync()
+
+        self.slack_oauth_states_collection.create_index(
+            _STATE_INDEX,
+            unique=True,
+            background=True,
+        )
         self.slack_oauth_states_collection.create_index(
-            [
-                ("state", ASCENDING),
-            ],
+            _EXPIRE_AT_INDEX,
+            expireAfterSeconds=0,
             background=True,
         )
 
-    def issue(self, *args, **kwargs) -> str:
-        self.logger.debug("args: %s, kwargs: %s", args, kwargs)
-        
-        state = str(uuid4())
-        
-        self.logger.debug("state: %s", state)
-        
-        self.slack_oauth_states_collection.insert_one(
-            {"state": state, "expire_at": time() + self.expiration_seconds}
+    async def async_init(self):
+        """Initialize database store by ensuring indexes exist on the proper fields"""
+        if not self._motor:
+            await self._run(self.init)
+            return
+
+        await asyncio.gather(
+            self.slack_oauth_states_collection.create_index(
+                _STATE_INDEX,
+                unique=True,
+                background=True,
+            ),
+            self.slack_oauth_states_collection.create_index(
+                _EXPIRE_AT_INDEX,
+                expireAfterSeconds=0,
+                background=True,
+            ),
+        )
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """Runs a blocking method in the executor so it doesn't block the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    def _new_states(self, n: int) -> Tuple[List[str], List[dict]]:
+        if n < 0:
+            raise ValueError(f"n must not be negative: {n}")
+
+        states = [secrets.token_urlsafe(16) for _ in range(n)]
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("states: %s", states)
+
+        expire_at = datetime.now(timezone.utc) + timedelta(
+            seconds=self.expiration_seconds
         )
-        return state
+        return states, [{"state": state, "expire_at": expire_at} for state in states]
+
+    def _is_valid(self, doc: Optional[dict]) -> bool:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("doc: %s", doc)
+
+        if doc is None:
+            return False
+
+        # The TTL monitor only runs periodically, so expired states
+        # may still be around for a while after expire_at
+        expire_at = doc.get("expire_at")
+        if isinstance(expire_at, (int, float)):
+            # Issued before expire_at became a date
+            return expire_at > time()
+        if not isinstance(expire_at, datetime):
+            return False
+        if expire_at.tzinfo is None:
+            expire_at = expire_at.replace(tzinfo=timezone.utc)
+        return expire_at > datetime.now(timezone.utc)
+
+    def issue(self, *args, **kwargs) -> str:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("args: %s, kwargs: %s", args, kwargs)
+
+        self._check_sync()
+        return self.issue_many(1)[0]
+
+    def issue_many(self, n: int) -> List[str]:
+        """Issues n states with a single insert_many round-trip"""
+        self._check_sync()
+
+        states, docs = self._new_states(n)
+        if docs:
+            self.slack_oauth_states_collection.insert_many(docs, ordered=False)
+        return states
 
     def consume(self, state: str) -> bool:
-        self.logger.debug("state: %s", state)
-        
-        delete_result = self.slack_oauth_states_collection.delete_many(
-            {"state": state, "expire_at": {"$gt": time()}}
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("state: %s", state)
+
+        self._check_sync()
+        doc = self.slack_oauth_states_collection.find_one_and_delete(
+            {"state": state},
+            projection=_EXPIRE_AT_PROJECTION,
+            hint=_STATE_INDEX,
         )
-        
-        self.logger.debug("delete_result: %s", delete_result)
-        
-        return delete_result.deleted_count > 0
+
+        return self._is_valid(doc)
 
     async def async_issue(self, *args, **kwargs) -> str:
-        return self.issue(*args, **kwargs)
+        if not self._motor:
+            return await self._run(self.issue, *args, **kwargs)
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("args: %s, kwargs: %s", args, kwargs)
+
+        return (await self.async_issue_many(1))[0]
+
+    async def async_issue_many(self, n: int) -> List[str]:
+        if not self._motor:
+            return await self._run(self.issue_many, n)
+
+        states, docs = self._new_states(n)
+        if docs:
+            await self.slack_oauth_states_collection.insert_many(docs, ordered=False)
+        return states
 
     async def async_consume(self, state: str) -> bool:
-        return self.consume(state)
+        if not self._motor:
+            return await self._run(self.consume, state)
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("state: %s", state)
+
+        doc = await self.slack_oauth_states_collection.find_one_and_delete(
+            {"state": state},
+            projection=_EXPIRE_AT_PROJECTION,
+            hint=_STATE_INDEX,
+        )
+
+        return self._is_valid(doc)
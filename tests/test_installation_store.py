@@ -0,0 +1,383 @@
+import asyncio
+
+import mongomock
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import DuplicateKeyError
+from slack_sdk.oauth.installation_store.models.bot import Bot
+from slack_sdk.oauth.installation_store.models.installation import Installation
+
+from slack_sdk_oauth_mongodb.installation_store.mongodb import MongoDBInstallationStore
+
+
+def installation(**kwargs) -> Installation:
+    return Installation(
+        **{
+            "app_id": "A111",
+            "team_id": "T111",
+            "user_id": "U111",
+            "bot_token": "xoxb-111",
+            "bot_id": "B111",
+            "bot_user_id": "W111",
+            "user_token": "xoxp-111",
+            "installed_at": 1000.0,
+            **kwargs,
+        }
+    )
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().db
+
+
+@pytest.fixture
+def store(db):
+    store = MongoDBInstallationStore(db, client_id="C111", flush_interval=0.01)
+    store.init()
+    return store
+
+
+@pytest.fixture
+def motor_store():
+    store = MongoDBInstallationStore(
+        AsyncMongoMockClient().db, client_id="C111", flush_interval=0.01
+    )
+    asyncio.run(store.async_init())
+    return store
+
+
+def test_save_and_find(store):
+    store.save(installation())
+    store.save(installation(bot_token="xoxb-222", installed_at=2000.0))
+
+    bot = store.find_bot(enterprise_id=None, team_id="T111")
+    assert bot.bot_token == "xoxb-222"
+
+    found = store.find_installation(enterprise_id=None, team_id="T111")
+    assert found.bot_token == "xoxb-222"
+
+    assert store.find_bot(enterprise_id=None, team_id="T222") is None
+    assert store.find_installation(enterprise_id=None, team_id="T222") is None
+
+
+def test_find_user_installation_keeps_latest_bot_token(store):
+    store.save(installation())
+    store.save(
+        installation(
+            bot_token=None, bot_id=None, user_token="xoxp-222", installed_at=2000.0
+        )
+    )
+
+    found = store.find_installation(enterprise_id=None, team_id="T111", user_id="U111")
+    assert found.user_token == "xoxp-222"
+    assert found.bot_token == "xoxb-111"
+    assert found.bot_id == "B111"
+
+    assert (
+        store.find_installation(enterprise_id=None, team_id="T111", user_id="U222")
+        is None
+    )
+
+
+def test_enterprise_install(store):
+    store.save(
+        installation(enterprise_id="E111", team_id=None, is_enterprise_install=True)
+    )
+
+    bot = store.find_bot(
+        enterprise_id="E111", team_id="T222", is_enterprise_install=True
+    )
+    assert bot.bot_token == "xoxb-111"
+
+
+def test_save_raises_duplicate_key_error(store, db):
+    db.slack_installations.create_index("user_id", unique=True)
+    store.save(installation())
+
+    with pytest.raises(DuplicateKeyError):
+        store.save(installation())
+
+
+def test_save_bot(store):
+    store.save_bot(
+        Bot(
+            app_id="A111",
+            team_id="T111",
+            bot_token="xoxb-111",
+            bot_id="B111",
+            bot_user_id="W111",
+            installed_at=1000.0,
+        )
+    )
+
+    assert store.find_bot(enterprise_id=None, team_id="T111").bot_token == "xoxb-111"
+    assert store.find_installation(enterprise_id=None, team_id="T111") is None
+
+
+def test_delete(store):
+    store.save(installation())
+    store.save(installation(user_id="U222"))
+    assert store.find_bot(enterprise_id=None, team_id="T111") is not None
+
+    store.delete_installation(enterprise_id=None, team_id="T111", user_id="U111")
+    assert (
+        store.find_installation(enterprise_id=None, team_id="T111", user_id="U111")
+        is None
+    )
+    assert store.find_bot(enterprise_id=None, team_id="T111") is not None
+
+    store.delete_installation(enterprise_id=None, team_id="T111")
+    assert store.find_installation(enterprise_id=None, team_id="T111") is None
+    assert store.find_bot(enterprise_id=None, team_id="T111") is None
+
+
+def test_save_invalidates_cache(store):
+    store.save(installation())
+    assert store.find_bot(enterprise_id=None, team_id="T111").bot_token == "xoxb-111"
+
+    store.save(installation(bot_token="xoxb-222", installed_at=2000.0))
+    assert store.find_bot(enterprise_id=None, team_id="T111").bot_token == "xoxb-222"
+
+    store.delete_bot(enterprise_id=None, team_id="T111")
+    assert store.find_bot(enterprise_id=None, team_id="T111") is None
+
+
+def test_read_racing_a_save_is_not_cached(store):
+    store.save(installation())
+    find_one = store.slack_bots_collection.find_one
+
+    def find_one_then_save(*args, **kwargs):
+        doc = find_one(*args, **kwargs)
+        store.slack_bots_collection.find_one = find_one
+        store.save(installation(bot_token="xoxb-222", installed_at=2000.0))
+        return doc
+
+    store.slack_bots_collection.find_one = find_one_then_save
+
+    assert store.find_bot(enterprise_id=None, team_id="T111").bot_token == "xoxb-111"
+    assert store.find_bot(enterprise_id=None, team_id="T111").bot_token == "xoxb-222"
+
+
+def test_cache_many_users_in_one_workspace(store):
+    # Each put used to rescan the whole workspace, quadratic in its users
+    cached = installation()
+    users = [f"U{i}" for i in range(10_000)]
+
+    for user_id in users:
+        key = (None, "T111", user_id)
+        _, generation = store._cache_get(store._installation_cache, key)
+        store._cache_put(store._installation_cache, key, cached, generation)
+
+    assert len(store._installation_cache) == len(users)
+    assert len(store._installation_cache_keys[(None, "T111")]) == len(users)
+
+    store.save(installation())
+    assert not store._installation_cache
+    assert (None, "T111") not in store._installation_cache_keys
+
+
+@pytest.mark.parametrize("cache_kwargs", [{"cache_maxsize": 0}, {"cache_ttl": 0}])
+def test_cache_can_be_disabled(db, cache_kwargs):
+    store = MongoDBInstallationStore(db, client_id="C111", **cache_kwargs)
+    store.save(installation())
+
+    assert store.find_bot(enterprise_id=None, team_id="T111").bot_token == "xoxb-111"
+    assert store.find_installation(enterprise_id=None, team_id="T111") is not None
+
+    db.slack_bots.delete_many({})
+    assert store.find_bot(enterprise_id=None, team_id="T111") is None
+
+
+def test_async_wrappers(store):
+    async def scenario():
+        await store.async_save(installation())
+        await store.async_save_bot(
+            Bot(
+                app_id="A111",
+                team_id="T222",
+                bot_token="xoxb-222",
+                bot_id="B222",
+                bot_user_id="W222",
+                installed_at=1000.0,
+            )
+        )
+
+        bot = await store.async_find_bot(enterprise_id=None, team_id="T111")
+        assert bot.bot_token == "xoxb-111"
+        bot = await store.async_find_bot(enterprise_id=None, team_id="T222")
+        assert bot.bot_token == "xoxb-222"
+
+        found = await store.async_find_installation(enterprise_id=None, team_id="T111")
+        assert found.user_token == "xoxp-111"
+        found = await store.async_find_installation(
+            enterprise_id=None, team_id="T111", user_id="U111"
+        )
+        assert found.user_token == "xoxp-111"
+
+        await store.async_delete_bot(enterprise_id=None, team_id="T222")
+        assert await store.async_find_bot(enterprise_id=None, team_id="T222") is None
+
+        await store.async_delete_installation(enterprise_id=None, team_id="T111")
+        assert (
+            await store.async_find_installation(enterprise_id=None, team_id="T111")
+            is None
+        )
+
+    asyncio.run(scenario())
+
+
+def test_motor(motor_store):
+    async def scenario():
+        await motor_store.async_save(installation())
+        bot = await motor_store.async_find_bot(enterprise_id=None, team_id="T111")
+        assert bot.bot_token == "xoxb-111"
+
+        await motor_store.async_save(
+            installation(
+                bot_token=None, bot_id=None, user_token="xoxp-222", installed_at=2000.0
+            )
+        )
+
+        found = await motor_store.async_find_installation(
+            enterprise_id=None, team_id="T111", user_id="U111"
+        )
+        assert found.user_token == "xoxp-222"
+        assert found.bot_token == "xoxb-111"
+
+        await motor_store.async_delete_installation(enterprise_id=None, team_id="T111")
+        assert (
+            await motor_store.async_find_bot(enterprise_id=None, team_id="T111") is None
+        )
+
+    asyncio.run(scenario())
+
+
+def test_motor_rejects_sync_methods(motor_store):
+    with pytest.raises(RuntimeError):
+        motor_store.init()
+    with pytest.raises(RuntimeError):
+        motor_store.save(installation())
+    with pytest.raises(RuntimeError):
+        motor_store.find_bot(enterprise_id=None, team_id="T111")
+    with pytest.raises(RuntimeError):
+        motor_store.find_installation(enterprise_id=None, team_id="T111")
+    with pytest.raises(RuntimeError):
+        motor_store.delete_installation(enterprise_id=None, team_id="T111")
+
+
+def test_flusher_batches_saves(store, db):
+    async def scenario():
+        await asyncio.gather(
+            *[store.async_save(installation(user_id=f"U{i}")) for i in range(10)]
+        )
+
+    asyncio.run(scenario())
+
+    assert db.slack_installations.count_documents({}) == 10
+    assert db.slack_bots.count_documents({}) == 10
+    assert store._flusher_task is None
+
+
+def test_flusher_fails_only_the_failed_writes(store, db):
+    db.slack_installations.create_index("user_id", unique=True)
+    store.save(installation())
+
+    async def scenario():
+        return await asyncio.gather(
+            store.async_save(installation()),
+            store.async_save(installation(user_id="U222")),
+            return_exceptions=True,
+        )
+
+    duplicate, saved = asyncio.run(scenario())
+
+    assert isinstance(duplicate, DuplicateKeyError)
+    assert saved is None
+    assert db.slack_installations.count_documents({}) == 2
+    # Both collections are written concurrently, so the bot of the
+    # installation that failed is still written
+    assert db.slack_bots.count_documents({}) == 3
+
+
+def test_flusher_restarts_after_cancellation(store, db):
+    async def cancelled():
+        asyncio.ensure_future(store.async_save(installation()))
+        await asyncio.sleep(0)
+
+    asyncio.run(cancelled())
+
+    async def scenario():
+        await asyncio.wait_for(store.async_save(installation(user_id="U222")), 1)
+
+    asyncio.run(scenario())
+
+    # The cancelled save is dropped along with its event loop
+    assert db.slack_installations.count_documents({}) == 1
+
+
+def test_flusher_restarts_after_a_closed_event_loop(store, db):
+    loop = asyncio.new_event_loop()
+    loop.create_task(store.async_save(installation()))
+    loop.run_until_complete(asyncio.sleep(0))
+    loop.close()
+
+    async def scenario():
+        await asyncio.wait_for(store.async_save(installation(user_id="U222")), 1)
+
+    asyncio.run(scenario())
+
+    assert [doc["user_id"] for doc in db.slack_installations.find()] == ["U222"]
+
+
+def test_batcher_coalesces_lookups(store):
+    for team_id in ("T111", "T222"):
+        store.save(installation(team_id=team_id))
+        store.save(
+            installation(team_id=team_id, bot_token="xoxb-222", installed_at=2000.0)
+        )
+
+    aggregate = store.slack_bots_collection.aggregate
+    calls = []
+
+    def counting_aggregate(*args, **kwargs):
+        calls.append(args)
+        return aggregate(*args, **kwargs)
+
+    store.slack_bots_collection.aggregate = counting_aggregate
+
+    async def scenario():
+        return await asyncio.gather(
+            *[
+                store.async_find_bot(enterprise_id=None, team_id=team_id)
+                for team_id in ("T111", "T222", "T111", "T333")
+            ]
+        )
+
+    bots = asyncio.run(scenario())
+
+    assert [bot and bot.bot_token for bot in bots] == [
+        "xoxb-222",
+        "xoxb-222",
+        "xoxb-222",
+        None,
+    ]
+    assert len(calls) == 1
+
+
+def test_batcher_survives_a_stopped_event_loop(store):
+    store.save(installation())
+    store.batch_window_ms = 50
+
+    async def abandoned():
+        asyncio.ensure_future(store.async_find_bot(enterprise_id=None, team_id="T111"))
+        await asyncio.sleep(0)
+
+    asyncio.run(abandoned())
+
+    async def scenario():
+        return await asyncio.wait_for(
+            store.async_find_bot(enterprise_id=None, team_id="T111"), 1
+        )
+
+    assert asyncio.run(scenario()).bot_token == "xoxb-111"
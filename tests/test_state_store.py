@@ -0,0 +1,117 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from time import time
+
+import mongomock
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from slack_sdk_oauth_mongodb.state_store.mongodb import MongoDBAsyncOAuthStateStore
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().db
+
+
+@pytest.fixture
+def store(db):
+    store = MongoDBAsyncOAuthStateStore(db, expiration_seconds=60)
+    store.init()
+    return store
+
+
+@pytest.fixture
+def motor_store():
+    store = MongoDBAsyncOAuthStateStore(
+        AsyncMongoMockClient().db, expiration_seconds=60
+    )
+    asyncio.run(store.async_init())
+    return store
+
+
+def test_issue_and_consume(store):
+    state = store.issue()
+
+    assert store.consume(state) is True
+    assert store.consume(state) is False
+    assert store.consume("unknown") is False
+
+
+def test_issue_many(store):
+    states = store.issue_many(3)
+
+    assert len(set(states)) == 3
+    assert all(store.consume(state) for state in states)
+
+
+def test_issue_none(store, db):
+    assert store.issue_many(0) == []
+    assert db.oauth_states.count_documents({}) == 0
+
+    with pytest.raises(ValueError):
+        store.issue_many(-1)
+
+
+def test_expired_state(store, db):
+    state = store.issue()
+    db.oauth_states.update_one(
+        {"state": state},
+        {"$set": {"expire_at": datetime.now(timezone.utc) - timedelta(seconds=1)}},
+    )
+
+    assert store.consume(state) is False
+    assert db.oauth_states.count_documents({}) == 0
+
+
+def test_float_expire_at(store, db):
+    # expire_at was a float timestamp before it became a date
+    db.oauth_states.insert_many(
+        [
+            {"state": "fresh", "expire_at": time() + 60},
+            {"state": "expired", "expire_at": time() - 1},
+        ]
+    )
+
+    assert store.consume("fresh") is True
+    assert store.consume("expired") is False
+
+
+def test_async(store):
+    async def scenario():
+        state = await store.async_issue()
+        assert await store.async_consume(state) is True
+        assert await store.async_consume(state) is False
+
+        states = await store.async_issue_many(2)
+        assert [await store.async_consume(state) for state in states] == [True, True]
+
+    asyncio.run(scenario())
+
+
+def test_motor(motor_store):
+    async def scenario():
+        state = await motor_store.async_issue()
+        assert await motor_store.async_consume(state) is True
+        assert await motor_store.async_consume(state) is False
+
+        assert await motor_store.async_issue_many(0) == []
+        with pytest.raises(ValueError):
+            await motor_store.async_issue_many(-1)
+
+        states = await motor_store.async_issue_many(2)
+        assert [await motor_store.async_consume(state) for state in states] == [
+            True,
+            True,
+        ]
+
+    asyncio.run(scenario())
+
+
+def test_motor_rejects_sync_methods(motor_store):
+    with pytest.raises(RuntimeError):
+        motor_store.init()
+    with pytest.raises(RuntimeError):
+        motor_store.issue()
+    with pytest.raises(RuntimeError):
+        motor_store.consume("state")